@@ -4,10 +4,10 @@ from fastapi import APIRouter, Form, Header
 from starlette.requests import Request
 from starlette.responses import RedirectResponse
 
-from fastapi_msal.core import MSALClientConfig, OptStr
+from fastapi_msal.core import MSALClientConfig, OptStr, SessionBackend
 from fastapi_msal.models import AuthToken, BearerToken, IDTokenClaims
-from fastapi_msal.security import MSALAuthCodeHandler, MSALScheme
 from fastapi_msal.models.id_token_claims import TokenStatus
+from fastapi_msal.security import MSALAuthCodeHandler, MSALScheme
 
 
 class MSALAuthorization:
@@ -16,8 +16,9 @@ class MSALAuthorization:
         client_config: MSALClientConfig,
         return_to_path: str = "/",
         tags: Optional[list[str]] = None,  # type: ignore [unused-ignore]
+        session_backend: Optional[SessionBackend] = None,
     ):
-        self.handler = MSALAuthCodeHandler(client_config=client_config)
+        self.handler = MSALAuthCodeHandler(client_config=client_config, session_backend=session_backend)
         if not tags:
             tags = ["authentication"]
         self.return_to_path = return_to_path
@@ -84,7 +85,7 @@ class MSALAuthorization:
     ) -> RedirectResponse:
         # check if callback_url is set, if not try to get it from referer header
         callback_url = callback_url or referer or str(self.return_to_path)
-        return self.handler.logout(request=request, callback_url=callback_url)
+        return await self.handler.logout(request=request, callback_url=callback_url)
 
     async def get_session_token(self, request: Request) -> Optional[AuthToken]:
         return await self.handler.get_token_from_session(request=request)
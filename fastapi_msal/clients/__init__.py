@@ -1 +1,5 @@
+from .app_token_cache import AppTokenCache as AppTokenCache
 from .async_conf_client import AsyncConfClient as AsyncConfClient
+from .client_pool import ClientPool as ClientPool
+from .jwks_client import JWKSKeyManager as JWKSKeyManager
+from .token_cache import PartitionedTokenCache as PartitionedTokenCache
@@ -0,0 +1,69 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Hashable
+from typing import Callable, ClassVar, Optional
+
+from fastapi_msal.models import AuthToken
+
+
+class _CachedToken:
+    __slots__ = ("expires_at", "refresh_at", "token")
+
+    def __init__(self, token: AuthToken, refresh_at: float, expires_at: float):
+        self.token = token
+        self.refresh_at = refresh_at
+        self.expires_at = expires_at
+
+
+class AppTokenCache:
+    """
+    Process wide cache of application (client credentials) tokens.
+    A token is served from memory until refresh_ratio of its lifetime has passed,
+     then it is renewed in the background while the current token is still served.
+    Concurrent callers of the same key share a single in-flight request to the token endpoint.
+    """
+
+    tokens: ClassVar[dict[Hashable, _CachedToken]] = {}
+    _inflight: ClassVar[dict[Hashable, "asyncio.Task[AuthToken]"]] = {}
+
+    @classmethod
+    async def get_token(
+        cls, key: Hashable, fetch: Callable[[], Awaitable[AuthToken]], refresh_ratio: float = 0.8
+    ) -> AuthToken:
+        now = time.monotonic()
+        cached: Optional[_CachedToken] = cls.tokens.get(key, None)
+        if cached and now < cached.expires_at:
+            if now >= cached.refresh_at:
+                cls._refresh(key, fetch, refresh_ratio)  # renew ahead of expiry, keep serving the current token
+            return cached.token
+        return await asyncio.shield(cls._refresh(key, fetch, refresh_ratio))
+
+    @classmethod
+    def _refresh(
+        cls, key: Hashable, fetch: Callable[[], Awaitable[AuthToken]], refresh_ratio: float
+    ) -> "asyncio.Task[AuthToken]":
+        task: Optional[asyncio.Task[AuthToken]] = cls._inflight.get(key, None)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(cls._fetch(key, fetch, refresh_ratio))
+            # background refreshes may have no one awaiting them, make sure their errors are retrieved
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            cls._inflight[key] = task
+        return task
+
+    @classmethod
+    async def _fetch(cls, key: Hashable, fetch: Callable[[], Awaitable[AuthToken]], refresh_ratio: float) -> AuthToken:
+        try:
+            acquired_at = time.monotonic()
+            token: AuthToken = await fetch()
+            if not token.error and token.expires_in:
+                lifetime: float = token.expires_in.total_seconds()
+                cls.tokens[key] = _CachedToken(
+                    token=token, refresh_at=acquired_at + lifetime * refresh_ratio, expires_at=acquired_at + lifetime
+                )
+            return token
+        finally:
+            cls._inflight.pop(key, None)
+
+    @classmethod
+    def clear(cls) -> None:
+        cls.tokens.clear()
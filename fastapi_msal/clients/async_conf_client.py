@@ -1,6 +1,7 @@
+import json
 from typing import Any, Callable, Optional, TypeVar
 
-from msal import ConfidentialClientApplication, SerializableTokenCache
+from msal import ConfidentialClientApplication, TokenCache
 from starlette.concurrency import run_in_threadpool
 
 from fastapi_msal.core import MSALClientConfig, OptStr, OptStrsDict, StrsDict
@@ -11,6 +12,9 @@ from fastapi_msal.models import (
     LocalAccount,
 )
 
+from .app_token_cache import AppTokenCache
+from .client_pool import ClientPool
+
 T = TypeVar("T")
 
 
@@ -18,41 +22,68 @@ class AsyncConfClient:
     def __init__(
         self,
         client_config: MSALClientConfig,
-        cache: Optional[SerializableTokenCache] = None,
+        cache: Optional[TokenCache] = None,
     ):
         self.client_config: MSALClientConfig = client_config
-        self._cca = ConfidentialClientApplication(
-            client_id=client_config.client_id,
-            client_credential=client_config.client_credential,
-            authority=client_config.authority,
-            app_name=client_config.app_name,
-            app_version=client_config.app_version,
-            token_cache=cache,
-        )
+        self._cache: Optional[TokenCache] = cache
+        self._bound_cca: Optional[ConfidentialClientApplication] = None
+
+    async def _get_cca(self) -> ConfidentialClientApplication:
+        if self._bound_cca is None:
+            if not ClientPool.has_app(client_config=self.client_config):
+                # building the shared application validates the authority over the network - keep it off the loop
+                await run_in_threadpool(ClientPool.get_app, self.client_config)
+            self._bound_cca = ClientPool.bind(client_config=self.client_config, cache=self._cache)
+        return self._bound_cca
 
     @staticmethod
     async def __execute_async__(func: Callable[..., T], **kwargs: Any) -> T:
+        """
+        Runs blocking MSAL calls (the ones doing network I/O) on the threadpool,
+         calls which only work on memory (cache lookups, building urls) are executed inline.
+        """
         result: T = await run_in_threadpool(func, **kwargs)
         return result
 
     async def validate_id_token(self, id_token: str, nonce: OptStr = None) -> bool:
+        cca = await self._get_cca()
         try:
-            await self.__execute_async__(self._cca.client.decode_id_token, id_token=id_token, nonce=nonce)
+            cca.client.decode_id_token(id_token=id_token, nonce=nonce)  # decode and compare claims only, no I/O
             return True
         except RuntimeError:
             return False
 
     async def get_application_token(self, claims_challenge: OptStrsDict = None) -> AuthToken:
+        """
+        Returns the application token from the process wide AppTokenCache,
+         the token endpoint is called only when the token is missing or due for refresh
+        """
+        key = (
+            ClientPool.client_key(self.client_config),
+            tuple(self.client_config.scopes),
+            json.dumps(claims_challenge, sort_keys=True) if claims_challenge else None,
+        )
+        # the fetching client gets an empty MSAL cache so a refresh always reaches the token endpoint
+        fetching_client = AsyncConfClient(client_config=self.client_config, cache=TokenCache())
+        return await AppTokenCache.get_token(
+            key=key,
+            fetch=lambda: fetching_client._acquire_application_token(claims_challenge=claims_challenge),
+            refresh_ratio=self.client_config.app_token_refresh_ratio,
+        )
+
+    async def _acquire_application_token(self, claims_challenge: OptStrsDict = None) -> AuthToken:
+        cca = await self._get_cca()
         token: StrsDict = await self.__execute_async__(
-            self._cca.acquire_token_for_client,
+            cca.acquire_token_for_client,
             scopes=self.client_config.scopes,
             claims_challenge=claims_challenge,
         )
         return AuthToken.parse_obj_debug(to_parse=token)
 
     async def get_delegated_user_token(self, user_assertion: str, claims_challenge: OptStrsDict = None) -> AuthToken:
+        cca = await self._get_cca()
         token: StrsDict = await self.__execute_async__(
-            self._cca.acquire_token_on_behalf_of,
+            cca.acquire_token_on_behalf_of,
             user_assertion=user_assertion,
             scopes=self.client_config.scopes,
             claims_challenge=claims_challenge,
@@ -68,8 +99,9 @@ class AsyncConfClient:
         domain_hint: OptStr = None,
         claims_challenge: OptStr = None,
     ) -> AuthCode:
-        auth_code: StrsDict = await self.__execute_async__(
-            func=self._cca.initiate_auth_code_flow,
+        cca = await self._get_cca()
+        # only generates the PKCE secrets and the authorization url, no I/O
+        auth_code: StrsDict = cca.initiate_auth_code_flow(
             scopes=self.client_config.scopes,
             redirect_uri=redirect_uri,
             state=state,
@@ -81,8 +113,9 @@ class AsyncConfClient:
         return AuthCode.parse_obj_debug(to_parse=auth_code)
 
     async def finalize_auth_flow(self, auth_code_flow: AuthCode, auth_response: AuthResponse) -> AuthToken:
+        cca = await self._get_cca()
         auth_token: StrsDict = await self.__execute_async__(
-            self._cca.acquire_token_by_auth_code_flow,
+            cca.acquire_token_by_auth_code_flow,
             auth_code_flow=auth_code_flow.model_dump(exclude_none=True),
             auth_response=auth_response.model_dump(exclude_none=True),
             scopes=self.client_config.scopes,
@@ -90,10 +123,16 @@ class AsyncConfClient:
         return AuthToken.parse_obj_debug(to_parse=auth_token)
 
     async def remove_account(self, account: LocalAccount) -> None:
-        await self.__execute_async__(self._cca.remove_account, account=account.model_dump(exclude_none=True))
+        cca = await self._get_cca()
+        cca.remove_account(account=account.model_dump(exclude_none=True))  # token cache only, no I/O
 
     async def get_accounts(self, username: OptStr = None) -> list[LocalAccount]:
-        accounts_objects: list[StrsDict] = await self.__execute_async__(self._cca.get_accounts, username=username)
+        cca = await self._get_cca()
+        accounts_objects: list[StrsDict]
+        if cca.authority.instance in cca.authority_groups:  # authority aliases already discovered, cache only
+            accounts_objects = cca.get_accounts(username=username)
+        else:
+            accounts_objects = await self.__execute_async__(cca.get_accounts, username=username)
         accounts: list[LocalAccount] = [LocalAccount.parse_obj_debug(to_parse=ao) for ao in accounts_objects]
         return accounts
 
@@ -105,8 +144,9 @@ class AsyncConfClient:
         force_refresh: Optional[bool] = False,
         claims_challenge: OptStrsDict = None,
     ) -> Optional[AuthToken]:
+        cca = await self._get_cca()
         token = await self.__execute_async__(
-            self._cca.acquire_token_silent,
+            cca.acquire_token_silent,
             scopes=self.client_config.scopes,
             account=(account.model_dump(exclude_none=True) if account else None),
             authority=authority,
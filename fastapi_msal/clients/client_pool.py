@@ -0,0 +1,77 @@
+import copy
+from threading import Lock
+from typing import ClassVar, Optional
+
+from msal import ConfidentialClientApplication, TokenCache
+
+from fastapi_msal.core import MSALClientConfig, OptStr
+
+ClientKey = tuple[OptStr, OptStr, str, OptStr, OptStr]
+
+
+class ClientPool:
+    """
+    Process wide registry of MSAL confidential client applications.
+    Building a `ConfidentialClientApplication` validates the authority and fetches its OIDC metadata,
+     so a single application object is kept per client configuration and reused by all requests.
+    Per request token caches are attached to a shallow copy of the shared application (see `bind`).
+    """
+
+    apps: ClassVar[dict[ClientKey, ConfidentialClientApplication]] = {}
+    _lock: ClassVar[Lock] = Lock()
+
+    @staticmethod
+    def client_key(client_config: MSALClientConfig) -> ClientKey:
+        return (
+            client_config.client_id,
+            client_config.client_credential,
+            client_config.authority,
+            client_config.app_name,
+            client_config.app_version,
+        )
+
+    @classmethod
+    def has_app(cls, client_config: MSALClientConfig) -> bool:
+        return cls.client_key(client_config) in cls.apps
+
+    @classmethod
+    def get_app(cls, client_config: MSALClientConfig) -> ConfidentialClientApplication:
+        key: ClientKey = cls.client_key(client_config)
+        app: Optional[ConfidentialClientApplication] = cls.apps.get(key, None)
+        if app is None:
+            with cls._lock:  # make sure only one application is built per key
+                app = cls.apps.get(key, None)
+                if app is None:
+                    app = ConfidentialClientApplication(
+                        client_id=client_config.client_id,
+                        client_credential=client_config.client_credential,
+                        authority=client_config.authority,
+                        app_name=client_config.app_name,
+                        app_version=client_config.app_version,
+                    )
+                    cls.apps.update({key: app})
+        return app
+
+    @classmethod
+    def bind(
+        cls, client_config: MSALClientConfig, cache: Optional[TokenCache] = None
+    ) -> ConfidentialClientApplication:
+        """
+        Returns the shared application for the config, attached to the given token cache.
+        Without a cache the shared application (and its own in-memory cache) is returned as is.
+        """
+        app: ConfidentialClientApplication = cls.get_app(client_config)
+        if cache is None:
+            return app
+        # The authority, metadata and http session are shared, only the cache bound clients are rebuilt
+        bound_app: ConfidentialClientApplication = copy.copy(app)
+        bound_app.token_cache = cache
+        bound_app.client, bound_app._regional_client = bound_app._build_client(
+            bound_app.client_credential, bound_app.authority
+        )
+        return bound_app
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls.apps.clear()
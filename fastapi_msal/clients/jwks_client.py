@@ -0,0 +1,112 @@
+import asyncio
+import json
+import time
+from contextlib import suppress
+from typing import Any, Optional
+
+import jwt
+from msal.authority import tenant_discovery
+from starlette.concurrency import run_in_threadpool
+
+from fastapi_msal.core import MSALClientConfig
+
+from .client_pool import ClientPool
+
+
+class JWKSKeyManager:
+    """
+    Keeps the authority signing keys (JWKS) in memory, indexed by their key id (kid).
+    The keys are fetched once, refreshed in the background every refresh_interval seconds,
+     and refetched on demand (at most once per min_refetch_interval seconds) when a token is signed by an unknown kid.
+    Tokens are then verified locally, without a network round trip per request.
+    """
+
+    def __init__(
+        self, client_config: MSALClientConfig, refresh_interval: float = 24 * 60 * 60, min_refetch_interval: float = 300
+    ):
+        self.client_config = client_config
+        self.refresh_interval = refresh_interval
+        self.min_refetch_interval = min_refetch_interval
+        self.keys: dict[str, jwt.PyJWK] = {}
+        self.fetched_at: Optional[float] = None
+        self._refresh_lock: Optional[asyncio.Lock] = None
+        self._refresher: Optional[asyncio.Task[None]] = None
+
+    @property
+    def discovery_endpoint(self) -> str:
+        return f"{self.client_config.authority.rstrip('/')}/v2.0/.well-known/openid-configuration"
+
+    def _fetch_keys(self) -> dict[str, jwt.PyJWK]:
+        # reuse the http session of the shared MSAL application
+        http_client = ClientPool.get_app(self.client_config).http_client
+        openid_config: dict[str, Any] = tenant_discovery(self.discovery_endpoint, http_client)
+        response = http_client.get(openid_config["jwks_uri"])
+        response.raise_for_status()
+        key_set = jwt.PyJWKSet.from_dict(json.loads(response.text))
+        return {key.key_id: key for key in key_set.keys if key.key_id}
+
+    async def refresh(self) -> None:
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        requested_at = time.monotonic()
+        async with self._refresh_lock:  # concurrent callers share a single fetch
+            if self.fetched_at is not None and self.fetched_at >= requested_at:
+                return
+            self.keys = await run_in_threadpool(self._fetch_keys)
+            self.fetched_at = time.monotonic()
+
+    def _start_refresher(self) -> None:
+        if self.refresh_interval and self._refresher is None:
+            self._refresher = asyncio.get_running_loop().create_task(self._refresh_forever(self.refresh_interval))
+
+    async def _refresh_forever(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            with suppress(Exception):  # keep serving the current keys, the next refresh (or unknown kid) will retry
+                await self.refresh()
+
+    async def get_key(self, kid: str) -> Optional[jwt.PyJWK]:
+        self._start_refresher()
+        if self.fetched_at is None:
+            await self.refresh()
+        key: Optional[jwt.PyJWK] = self.keys.get(kid, None)
+        if key is None and time.monotonic() - (self.fetched_at or 0) >= self.min_refetch_interval:
+            await self.refresh()  # the keys might have been rotated
+            key = self.keys.get(kid, None)
+        return key
+
+    async def verify(self, token: str) -> Optional[dict[str, Any]]:
+        """
+        Verifies the RS256 signature of the token and returns its claims, or None if the token can not be verified.
+        Only the signature is checked here, the claims are validated by IDTokenClaims.validate_token
+        """
+        try:
+            header: dict[str, Any] = jwt.get_unverified_header(token)
+        except jwt.PyJWTError:
+            return None
+        key: Optional[jwt.PyJWK] = await self.get_key(str(header.get("kid", "")))
+        if key is None:
+            return None
+        try:
+            claims: dict[str, Any] = jwt.decode(
+                token,
+                key=key,
+                algorithms=["RS256"],
+                options={
+                    "verify_exp": False,
+                    "verify_nbf": False,
+                    "verify_iat": False,
+                    "verify_aud": False,
+                    "verify_iss": False,
+                },
+            )
+        except jwt.PyJWTError:
+            return None
+        return claims
+
+    async def close(self) -> None:
+        if self._refresher is not None:
+            self._refresher.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._refresher
+            self._refresher = None
@@ -0,0 +1,68 @@
+import json
+from typing import Any, ClassVar, Optional
+
+from msal import TokenCache
+
+from fastapi_msal.core import OptBytes, SessionManager
+
+
+class PartitionedTokenCache(TokenCache):  # type: ignore [misc]
+    """
+    MSAL token cache persisted in the session as one partition (session field) per credential type.
+    Since the token cache is kept per session it holds the entries of a single home account,
+     so every partition is in effect keyed by (home account, credential type).
+    Only the partitions that are needed are loaded, and only the partitions whose entries actually changed are saved.
+    """
+
+    field_prefix: ClassVar[str] = "token_cache:"
+    partitions: ClassVar[tuple[str, ...]] = (
+        TokenCache.CredentialType.ACCOUNT,
+        TokenCache.CredentialType.ACCESS_TOKEN,
+        TokenCache.CredentialType.REFRESH_TOKEN,
+        TokenCache.CredentialType.ID_TOKEN,
+        TokenCache.CredentialType.APP_METADATA,
+    )
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.loaded_partitions: set[str] = set()
+        self.changed_partitions: set[str] = set()
+
+    @property
+    def has_state_changed(self) -> bool:
+        return bool(self.changed_partitions)
+
+    def modify(self, credential_type: str, old_entry: dict[str, Any], new_key_value_pairs: Any = None) -> None:
+        # All MSAL cache mutations go through modify, mark the partition only if the entry really changed
+        key: str = self.key_makers[credential_type](**old_entry)
+        with self._lock:
+            before: Optional[dict[str, Any]] = self._cache.get(credential_type, {}).get(key, None)
+            super().modify(credential_type, old_entry, new_key_value_pairs)
+            if self._cache.get(credential_type, {}).get(key, None) != before:
+                self.changed_partitions.add(credential_type)
+
+    async def load(self, session: SessionManager, *credential_types: str) -> None:
+        """
+        Loads the given partitions (all of them if none given) from the session, already loaded ones are skipped
+        """
+        for credential_type in credential_types or self.partitions:
+            if credential_type in self.loaded_partitions:
+                continue
+            raw_partition: OptBytes = await session.load_raw(field=f"{self.field_prefix}{credential_type}")
+            stored: dict[str, Any] = json.loads(raw_partition) if raw_partition else {}
+            with self._lock:
+                # keep entries added before the partition was loaded
+                stored.update(self._cache.get(credential_type, {}))
+                self._cache[credential_type] = stored
+            self.loaded_partitions.add(credential_type)
+
+    async def save(self, session: SessionManager) -> None:
+        """
+        Saves the changed partitions to the session
+        """
+        for credential_type in sorted(self.changed_partitions):
+            await self.load(session, credential_type)  # never overwrite entries that were not loaded
+            with self._lock:
+                raw_partition = json.dumps(self._cache.get(credential_type, {}), separators=(",", ":")).encode()
+            await session.save_raw(field=f"{self.field_prefix}{credential_type}", value=raw_partition)
+        self.changed_partitions.clear()
@@ -1,6 +1,15 @@
 from .msal_client_config import MSALClientConfig as MSALClientConfig
 from .msal_client_config import MSALPolicies as MSALPolicies
+from .session_backends import CacheStats as CacheStats
+from .session_backends import InMemoryBackend as InMemoryBackend
+from .session_backends import RedisBackend as RedisBackend
+from .session_backends import SessionBackend as SessionBackend
+from .session_backends import SQLiteBackend as SQLiteBackend
+from .session_manager import CacheType as CacheType
 from .session_manager import SessionManager as SessionManager
+from .session_manager import create_session_backend as create_session_backend
+from .utils import OptBytes as OptBytes
+from .utils import OptInt as OptInt
 from .utils import OptStr as OptStr
 from .utils import OptStrList as OptStrList
 from .utils import OptStrsDict as OptStrsDict
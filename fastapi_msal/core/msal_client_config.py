@@ -5,7 +5,8 @@ from typing import ClassVar
 
 from pydantic_settings import BaseSettings
 
-from .utils import OptStr
+from .session_manager import CacheType
+from .utils import OptInt, OptStr
 
 
 class MSALPolicies(str, Enum):
@@ -42,8 +43,20 @@ class MSALClientConfig(BaseSettings):
 
     # Optional to set - If you are unsure don't set - it will be filled by MSAL as required
     scopes: ClassVar[list[str]] = []
-    # Not in use - for future support
-    session_type: str = "filesystem"
+
+    # Session storage backend, use FILE or REDIS to share sessions between workers
+    session_type: CacheType = CacheType.IN_MEMORY
+    # The database file path (FILE) or server url (REDIS) of the session storage
+    session_url: OptStr = None
+    # Maximum number of connections kept open to the session storage
+    session_pool_size: int = 10
+    # In-memory session cache limits - maximum number of sessions (least recently used are evicted first),
+    # seconds without access before a session expires and seconds from creation before it expires
+    # (None disables the limit). Set the sweep interval to also remove expired sessions in the background
+    session_max_entries: OptInt = 100_000
+    session_idle_ttl: OptInt = 24 * 60 * 60
+    session_absolute_ttl: OptInt = None
+    session_sweep_interval: OptInt = None
 
     # Set the following params if you wish to change the default MSAL Router endpoints
     path_prefix: str = ""
@@ -52,6 +65,19 @@ class MSALClientConfig(BaseSettings):
     logout_path: str = "/_logout_route"
     show_in_docs: bool = False
 
+    # Verify the signature of bearer tokens against the authority signing keys (JWKS), which are cached in memory,
+    # refreshed in the background every jwks_refresh_interval seconds and refetched on unknown key ids
+    # (at most once every jwks_min_refetch_interval seconds)
+    verify_token_signature: bool = False
+    jwks_refresh_interval: int = 24 * 60 * 60
+    jwks_min_refetch_interval: int = 5 * 60
+
+    # Application tokens are renewed in the background once this fraction of their lifetime has passed
+    app_token_refresh_ratio: float = 0.8
+
+    # Maximum number of decoded bearer token claims kept in memory until the tokens expire (0 disables the cache)
+    claims_cache_size: int = 10_000
+
     # Optional uri for redirect (token path) in cases where the app is behind a reverse proxy (PR #35)
     redirect_uri: OptStr = None
 
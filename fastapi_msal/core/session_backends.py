@@ -0,0 +1,276 @@
+import asyncio
+import queue
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager, suppress
+from typing import Any, Optional, Union
+from weakref import WeakValueDictionary
+
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+
+from .utils import OptBytes
+
+
+class SessionBackend(ABC):
+    """
+    The storage interface behind the SessionManager.
+    Each session is a hash of fields (one per saved model) stored under the session id,
+     fields are read and written individually so concurrent saves of different models never clobber each other.
+    Field values are the serialized model bytes, backends store and return them as is.
+    """
+
+    def __init__(self) -> None:
+        self._locks: WeakValueDictionary[str, asyncio.Lock] = WeakValueDictionary()
+
+    @abstractmethod
+    async def get_field(self, key: str, field: str) -> OptBytes:
+        """
+        Returns the field of the session stored under key, or None if there is no such session or field
+        """
+
+    @abstractmethod
+    async def set_field(self, key: str, field: str, value: bytes) -> None:
+        """
+        Sets a single field of the session stored under key (creating the session if needed)
+        """
+
+    @abstractmethod
+    async def remove(self, key: str) -> None:
+        """
+        Removes the session stored under key (if any)
+        """
+
+    def lock(self, key: str) -> asyncio.Lock:
+        """
+        Returns the lock of the session stored under key, use it to serialize read-modify-write sequences.
+        The locks are process local and released from memory once no one is holding them.
+        """
+        session_lock: Optional[asyncio.Lock] = self._locks.get(key, None)
+        if session_lock is None:
+            session_lock = asyncio.Lock()
+            self._locks[key] = session_lock
+        return session_lock
+
+    async def close(self) -> None:  # noqa: B027
+        """
+        Releases any resources (connections, files) held by the backend
+        """
+
+
+class CacheStats(BaseModel):
+    """
+    Counters of the in-memory session cache, use them to size the cache limits
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evicted: int = 0
+    """
+    Sessions removed to keep the cache under max_entries (least recently used first)
+    """
+    expired_idle: int = 0
+    """
+    Sessions removed since they were not accessed for idle_ttl seconds
+    """
+    expired_absolute: int = 0
+    """
+    Sessions removed since they were created more than absolute_ttl seconds ago
+    """
+
+
+class _CacheEntry:
+    __slots__ = ("accessed_at", "created_at", "fields")
+
+    def __init__(self, created_at: float):
+        self.fields: dict[str, bytes] = {}
+        self.created_at = created_at
+        self.accessed_at = created_at
+
+
+class InMemoryBackend(SessionBackend):
+    """
+    Process local session storage - sessions are lost on restart and are not shared between workers.
+    The cache is bounded by max_entries (least recently used sessions are evicted first),
+     and sessions expire after idle_ttl seconds without access or absolute_ttl seconds after creation.
+    Expiry is checked lazily on access, set sweep_interval to also remove expired sessions in the background.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        idle_ttl: Optional[float] = None,
+        absolute_ttl: Optional[float] = None,
+        sweep_interval: Optional[float] = None,
+    ):
+        super().__init__()
+        self.max_entries = max_entries
+        self.idle_ttl = idle_ttl
+        self.absolute_ttl = absolute_ttl
+        self.sweep_interval = sweep_interval
+        self.stats = CacheStats()
+        self.cache_db: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._sweeper: Optional[asyncio.Task[None]] = None
+
+    def __len__(self) -> int:
+        return len(self.cache_db)
+
+    def _expired(self, entry: _CacheEntry, now: float) -> bool:
+        if self.idle_ttl is not None and now - entry.accessed_at > self.idle_ttl:
+            self.stats.expired_idle += 1
+            return True
+        if self.absolute_ttl is not None and now - entry.created_at > self.absolute_ttl:
+            self.stats.expired_absolute += 1
+            return True
+        return False
+
+    def _start_sweeper(self) -> None:
+        if self.sweep_interval and self._sweeper is None:
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep_forever(self.sweep_interval))
+
+    async def _sweep_forever(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            self.sweep()
+
+    def sweep(self) -> None:
+        """
+        Removes all the expired sessions
+        """
+        now = time.monotonic()
+        for key, entry in list(self.cache_db.items()):
+            if self._expired(entry, now):
+                self.cache_db.pop(key, None)
+
+    def _get_entry(self, key: str, now: float) -> Optional[_CacheEntry]:
+        self._start_sweeper()
+        entry: Optional[_CacheEntry] = self.cache_db.get(key, None)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        if self._expired(entry, now):
+            self.cache_db.pop(key, None)
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        entry.accessed_at = now
+        self.cache_db.move_to_end(key)
+        return entry
+
+    async def get_field(self, key: str, field: str) -> OptBytes:
+        entry: Optional[_CacheEntry] = self._get_entry(key, time.monotonic())
+        return entry.fields.get(field, None) if entry else None
+
+    async def set_field(self, key: str, field: str, value: bytes) -> None:
+        now = time.monotonic()
+        entry: Optional[_CacheEntry] = self._get_entry(key, now)
+        if entry is None:
+            entry = _CacheEntry(created_at=now)
+            self.cache_db[key] = entry
+            if self.max_entries is not None:
+                while len(self.cache_db) > self.max_entries:
+                    self.cache_db.popitem(last=False)
+                    self.stats.evicted += 1
+        entry.fields[field] = value
+
+    async def remove(self, key: str) -> None:
+        self.cache_db.pop(key, None)
+
+    async def close(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._sweeper
+            self._sweeper = None
+
+
+class SQLiteBackend(SessionBackend):
+    """
+    File based session storage, can be shared by all the workers running on the same host.
+    Blocking sqlite calls are executed on the threadpool using a bounded pool of connections.
+    """
+
+    def __init__(self, path: str = "fastapi_msal_sessions.db", pool_size: int = 5):
+        super().__init__()
+        self.path = path
+        self._pool: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        for _ in range(pool_size):
+            self._pool.put(self._connect())
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS session_fields "
+            "(key TEXT NOT NULL, field TEXT NOT NULL, value BLOB NOT NULL, PRIMARY KEY (key, field))"
+        )
+        return connection
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        connection = self._pool.get()
+        try:
+            yield connection
+        finally:
+            self._pool.put(connection)
+
+    def _execute(self, sql: str, *params: Union[str, bytes]) -> Optional[tuple[Any, ...]]:
+        with self._connection() as connection:
+            row: Optional[tuple[Any, ...]] = connection.execute(sql, params).fetchone()
+            return row
+
+    async def get_field(self, key: str, field: str) -> OptBytes:
+        sql = "SELECT value FROM session_fields WHERE key = ? AND field = ?"
+        row = await run_in_threadpool(self._execute, sql, key, field)
+        return bytes(row[0]) if row else None
+
+    async def set_field(self, key: str, field: str, value: bytes) -> None:
+        sql = (
+            "INSERT INTO session_fields (key, field, value) VALUES (?, ?, ?) "
+            "ON CONFLICT(key, field) DO UPDATE SET value = excluded.value"
+        )
+        await run_in_threadpool(self._execute, sql, key, field, value)
+
+    async def remove(self, key: str) -> None:
+        await run_in_threadpool(self._execute, "DELETE FROM session_fields WHERE key = ?", key)
+
+    async def close(self) -> None:
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+
+class RedisBackend(SessionBackend):
+    """
+    Session storage on any server speaking the Redis protocol (Redis, Valkey, KeyDB, Dragonfly...)
+    Sessions are shared by all workers and hosts, each session is kept as a Redis hash.
+    Requires the redis package (pip install "fastapi_msal[redis]")
+    """
+
+    def __init__(
+        self, url: str = "redis://localhost:6379/0", pool_size: int = 10, prefix: str = "fastapi_msal:session:"
+    ):
+        super().__init__()
+        try:
+            from redis import asyncio as aioredis  # noqa: PLC0415
+        except ImportError as e:
+            msg = 'The redis package is required for the Redis session backend (pip install "fastapi_msal[redis]")'
+            raise ImportError(msg) from e
+        self.prefix = prefix
+        pool = aioredis.ConnectionPool.from_url(url, max_connections=pool_size)
+        self._redis: Any = aioredis.Redis(connection_pool=pool)
+
+    async def get_field(self, key: str, field: str) -> OptBytes:
+        value: OptBytes = await self._redis.hget(f"{self.prefix}{key}", field)
+        return value
+
+    async def set_field(self, key: str, field: str, value: bytes) -> None:
+        await self._redis.hset(f"{self.prefix}{key}", field, value)
+
+    async def remove(self, key: str) -> None:
+        await self._redis.delete(f"{self.prefix}{key}")
+
+    async def close(self) -> None:
+        await self._redis.aclose()
@@ -1,92 +1,115 @@
-import json
+import asyncio
 from enum import Enum
 from typing import ClassVar, Optional, TypeVar
 
 from fastapi import Request
 from pydantic import BaseModel
 
-from .utils import OptStr, OptStrsDict, StrsDict
+from .session_backends import InMemoryBackend, RedisBackend, SessionBackend, SQLiteBackend
+from .utils import OptBytes, OptStr
 
 M = TypeVar("M", bound=BaseModel)
 SESSION_KEY: str = "sid"
 
 
-class CacheType(Enum):
-    COOKIE = 1
-    IN_MEMORY = 2
-    FILE = 3
-
-
-class CacheManager:
-    cache_db: ClassVar[StrsDict] = {}
-
-    def __init__(self) -> None:
-        pass
-
-    @classmethod
-    def write(cls, key: str, value: StrsDict) -> None:  # TODO: make sure we run this one at a time
-        value_json: str = json.dumps(value)
-        cls.cache_db.update({key: value_json})
-
-    @classmethod
-    def read(cls, key: str) -> Optional[StrsDict]:  # TODO: make sure we run this one at a time
-        value_json: OptStr = cls.cache_db.get(key, None)
-        if value_json:
-            return json.loads(value_json)  # type: ignore
-        return None
-
-    @classmethod
-    def remove(cls, key: str) -> None:  # TODO: make sure we run this one at a time
-        cls.cache_db.pop(key, None)
+class CacheType(str, Enum):
+    """
+    The built-in session storage backends
+    """
+
+    # Process local storage, sessions are lost on restart and not shared between workers
+    IN_MEMORY = "IN_MEMORY"
+    # SQLite file storage, shared between the workers of a single host
+    FILE = "FILE"
+    # Redis protocol server storage, shared between all workers and hosts
+    REDIS = "REDIS"
+
+
+def create_session_backend(
+    cache_type: CacheType,
+    url: OptStr = None,
+    pool_size: int = 10,
+    *,
+    max_entries: Optional[int] = None,
+    idle_ttl: Optional[float] = None,
+    absolute_ttl: Optional[float] = None,
+    sweep_interval: Optional[float] = None,
+) -> SessionBackend:
+    """
+    Builds one of the built-in backends,
+     url is the database file path for the FILE backend and the server url for the REDIS backend.
+    The size and lifetime limits apply to the IN_MEMORY backend.
+    """
+    if CacheType.FILE == cache_type:
+        return SQLiteBackend(path=url, pool_size=pool_size) if url else SQLiteBackend(pool_size=pool_size)
+    if CacheType.REDIS == cache_type:
+        return RedisBackend(url=url, pool_size=pool_size) if url else RedisBackend(pool_size=pool_size)
+    return InMemoryBackend(
+        max_entries=max_entries, idle_ttl=idle_ttl, absolute_ttl=absolute_ttl, sweep_interval=sweep_interval
+    )
 
 
 class SessionManager:
-    def __init__(self, request: Request):
+    default_backend: ClassVar[SessionBackend] = InMemoryBackend()
+
+    def __init__(self, request: Request, backend: Optional[SessionBackend] = None):
         self.request = request
-        self.cache_manager = CacheManager
+        self.backend: SessionBackend = backend if backend is not None else self.default_backend
 
     @property
     def session_id(self) -> OptStr:
-        return str(self.request.session.get(SESSION_KEY, None))
+        session_id: OptStr = self.request.session.get(SESSION_KEY, None)
+        return str(session_id) if session_id else None
 
     def init_session(self, session_id: str) -> None:
         self.request.session.update({SESSION_KEY: session_id})
 
-    def _read_session(self) -> OptStrsDict:
-        if not self.session_id:
-            return None
-        session: OptStrsDict = self.cache_manager.read(self.session_id)
-        if session:
-            return session
-        return {}  # return empty session object
-
-    def _write_session(self, session: StrsDict) -> None:
-        if not self.session_id:
-            msg = "No session id, (Make sure you initialized the session by calling init_session)"
-            raise OSError(msg)
-        self.cache_manager.write(key=self.session_id, value=session)
-
-    def save(self, model: M) -> None:
-        session: OptStrsDict = self._read_session()
-        if session is None:
+    def _require_session_id(self) -> str:
+        session_id: OptStr = self.session_id
+        if not session_id:
             msg = "No session id, (Make sure you initialized the session by calling init_session)"
             raise OSError(msg)
-        session.update({model.__repr_name__(): model.model_dump_json(exclude_none=True, by_alias=True)})  # type: ignore
-        self._write_session(session=session)
-
-    def load(self, model_cls: type[M]) -> Optional[M]:
-        session: OptStrsDict = self._read_session()
-        if session:
-            raw_model: OptStr = session.get(model_cls.__name__, None)
-            if raw_model:
-                return model_cls.model_validate_json(raw_model)
+        return session_id
+
+    def lock(self) -> asyncio.Lock:
+        """
+        Per session lock, hold it across a load-modify-save sequence to avoid lost updates:
+            async with session.lock():
+                ...
+        """
+        return self.backend.lock(self._require_session_id())
+
+    async def save(self, model: M) -> None:
+        # serialize once, straight to the utf-8 bytes kept by the backend (no str round trip)
+        raw_model: bytes = model.__pydantic_serializer__.to_json(model, exclude_none=True, by_alias=True)
+        await self.backend.set_field(key=self._require_session_id(), field=type(model).__name__, value=raw_model)
+
+    async def load(self, model_cls: type[M]) -> Optional[M]:
+        session_id: OptStr = self.session_id
+        if not session_id:
+            return None
+        raw_model: OptBytes = await self.backend.get_field(key=session_id, field=model_cls.__name__)
+        if raw_model:
+            return model_cls.model_validate_json(raw_model)
         return None
 
-    def clear(self) -> None:
+    async def save_raw(self, field: str, value: bytes) -> None:
+        """
+        Stores an already serialized value (e.g. the MSAL token cache) in the session
+        """
+        await self.backend.set_field(key=self._require_session_id(), field=field, value=value)
+
+    async def load_raw(self, field: str) -> OptBytes:
+        session_id: OptStr = self.session_id
+        if not session_id:
+            return None
+        return await self.backend.get_field(key=session_id, field=field)
+
+    async def clear(self) -> None:
         session_id = self.session_id
         if not session_id:
             return  # there is no session to clear
-        # clear the session object from cache
-        self.cache_manager.remove(session_id)
+        # clear the session object from storage
+        await self.backend.remove(session_id)
         # clear the session_id from the session cookie
         self.request.session.pop(SESSION_KEY, None)
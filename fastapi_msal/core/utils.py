@@ -1,6 +1,8 @@
 from typing import Optional
 
 OptStr = Optional[str]
+OptInt = Optional[int]
+OptBytes = Optional[bytes]
 StrList = list[str]
 OptStrList = Optional[StrList]
 StrsDict = dict[str, str]
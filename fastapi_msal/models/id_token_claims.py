@@ -1,7 +1,7 @@
 import json
 import time
 from enum import Enum
-from typing import Optional, Union
+from typing import Any, Optional, Union
 
 from msal.oauth2cli import oidc
 from pydantic import BaseModel, Field, PrivateAttr
@@ -204,8 +204,15 @@ class IDTokenClaims(UserInfo, AADInternalClaims, BaseAuthModel):
     @staticmethod
     def decode_id_token(id_token: str) -> Optional["IDTokenClaims"]:
         decoded: OptStrsDict = json.loads(oidc.decode_part(id_token.split(".")[1]))
-        if decoded:
-            token_claims = IDTokenClaims.model_validate(decoded)
+        return IDTokenClaims.from_claims(claims=decoded, id_token=id_token)
+
+    @staticmethod
+    def from_claims(claims: Optional[dict[str, Any]], id_token: str) -> Optional["IDTokenClaims"]:
+        """
+        Builds the object from already decoded (e.g. signature verified) claims of the id_token
+        """
+        if claims:
+            token_claims = IDTokenClaims.model_validate(claims)
             token_claims._id_token = id_token
             return token_claims
         return None
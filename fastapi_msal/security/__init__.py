@@ -1,2 +1,3 @@
+from .claims_cache import ClaimsCache as ClaimsCache
 from .msal_auth_code_handler import MSALAuthCodeHandler as MSALAuthCodeHandler
 from .msal_scheme import MSALScheme as MSALScheme
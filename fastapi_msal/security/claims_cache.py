@@ -0,0 +1,48 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from fastapi_msal.models import IDTokenClaims
+
+
+class ClaimsCache:
+    """
+    Bounded LRU cache of decoded token claims, keyed by the SHA-256 digest of the raw token.
+    Entries are kept until the token expires, so repeating callers skip the decode and model validation.
+    The cached claims object is shared between requests and should be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[bytes, IDTokenClaims] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str, now: Optional[float] = None) -> Optional[IDTokenClaims]:
+        digest: bytes = self._digest(token)
+        claims: Optional[IDTokenClaims] = self._entries.get(digest, None)
+        if claims is None:
+            return None
+        if claims.exp is None or claims.exp < (now or time.time()):
+            self._entries.pop(digest, None)
+            return None
+        self._entries.move_to_end(digest)
+        return claims
+
+    def put(self, token: str, claims: IDTokenClaims, now: Optional[float] = None) -> None:
+        if self.max_entries <= 0 or claims.exp is None or claims.exp < (now or time.time()):
+            return  # tokens without expiry (or already expired) are not cached
+        digest: bytes = self._digest(token)
+        self._entries[digest] = claims
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
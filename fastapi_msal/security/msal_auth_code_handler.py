@@ -1,11 +1,17 @@
 from typing import Optional, Union
 
 from fastapi import HTTPException, Request, status
-from msal import SerializableTokenCache
+from msal import TokenCache
 from starlette.responses import RedirectResponse
 
-from fastapi_msal.clients import AsyncConfClient
-from fastapi_msal.core import MSALClientConfig, OptStr, SessionManager, StrsDict
+from fastapi_msal.clients import AsyncConfClient, JWKSKeyManager, PartitionedTokenCache
+from fastapi_msal.core import (
+    MSALClientConfig,
+    OptStr,
+    SessionBackend,
+    SessionManager,
+    create_session_backend,
+)
 from fastapi_msal.models import (
     AuthCode,
     AuthResponse,
@@ -14,78 +20,115 @@ from fastapi_msal.models import (
     LocalAccount,
 )
 
+from .claims_cache import ClaimsCache
+
+LEGACY_TOKEN_CACHE_KEY: str = "token_cache"  # noqa: S105
+
 
 class MSALAuthCodeHandler:
-    def __init__(self, client_config: MSALClientConfig):
+    def __init__(self, client_config: MSALClientConfig, session_backend: Optional[SessionBackend] = None):
         self.client_config: MSALClientConfig = client_config
+        if session_backend is None:
+            session_backend = create_session_backend(
+                cache_type=client_config.session_type,
+                url=client_config.session_url,
+                pool_size=client_config.session_pool_size,
+                max_entries=client_config.session_max_entries,
+                idle_ttl=client_config.session_idle_ttl,
+                absolute_ttl=client_config.session_absolute_ttl,
+                sweep_interval=client_config.session_sweep_interval,
+            )
+        self.session_backend: SessionBackend = session_backend
+        self.claims_cache = ClaimsCache(max_entries=client_config.claims_cache_size)
+        self.key_manager = JWKSKeyManager(
+            client_config=client_config,
+            refresh_interval=client_config.jwks_refresh_interval,
+            min_refetch_interval=client_config.jwks_min_refetch_interval,
+        )
+
+    def session(self, request: Request) -> SessionManager:
+        return SessionManager(request=request, backend=self.session_backend)
 
     async def authorize_redirect(self, request: Request, redirec_uri: str, state: OptStr = None) -> RedirectResponse:
         auth_code: AuthCode = await self.msal_app().initiate_auth_flow(redirect_uri=redirec_uri, state=state)
-        session = SessionManager(request=request)
+        session = self.session(request=request)
         session.init_session(session_id=auth_code.state)
-        await auth_code.save_to_session(session=SessionManager(request=request))
+        await auth_code.save_to_session(session=session)
         return RedirectResponse(auth_code.auth_uri)
 
     async def authorize_access_token(self, request: Request, code: str, state: OptStr = None) -> AuthToken:
         http_exception = HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication Error")
-        auth_code: Optional[AuthCode] = await AuthCode.load_from_session(session=SessionManager(request=request))
+        session = self.session(request=request)
+        auth_code: Optional[AuthCode] = await AuthCode.load_from_session(session=session)
         if (not auth_code) or (not auth_code.state):
             raise http_exception
         if state and (state != auth_code.state):  # extra validation for correct state if passed in
             raise http_exception
         auth_response = AuthResponse(code=code, state=auth_code.state)
-        cache: SerializableTokenCache = self._load_cache(session=request.session)
-        auth_token: AuthToken = await self.msal_app(cache=cache).finalize_auth_flow(
-            auth_code_flow=auth_code, auth_response=auth_response
-        )
-        if auth_token.error or not auth_token.id_token:
-            if auth_token.error_description:
-                http_exception.detail = f"{auth_token.error}: {auth_token.error_description}"
-            raise http_exception
-        await auth_token.save_to_session(session=SessionManager(request=request))
-        self._save_cache(session=request.session, cache=cache)
+        async with session.lock():  # concurrent callbacks of the same session must not overwrite each other
+            # nothing needs to be loaded up front, changed partitions are merged with the stored ones on save
+            cache: PartitionedTokenCache = PartitionedTokenCache()
+            auth_token: AuthToken = await self.msal_app(cache=cache).finalize_auth_flow(
+                auth_code_flow=auth_code, auth_response=auth_response
+            )
+            if auth_token.error or not auth_token.id_token:
+                if auth_token.error_description:
+                    http_exception.detail = f"{auth_token.error}: {auth_token.error_description}"
+                raise http_exception
+            await auth_token.save_to_session(session=session)
+            await self._save_cache(session=session, cache=cache)
+        # the token cache used to be kept in the session cookie, make sure no stale copy is sent back
+        request.session.pop(LEGACY_TOKEN_CACHE_KEY, None)
         return auth_token
 
     async def parse_id_token(self, *, token: Union[AuthToken, str]) -> Optional[IDTokenClaims]:
-        if isinstance(token, AuthToken):
+        if isinstance(token, AuthToken):  # received directly from the token endpoint
             if token.id_token_claims:
                 return token.id_token_claims
-            id_token: str = token.id_token
+            return IDTokenClaims.decode_id_token(id_token=token.id_token)
+        token_claims: Optional[IDTokenClaims] = self.claims_cache.get(token=token)
+        if token_claims:
+            return token_claims
+        if self.client_config.verify_token_signature:
+            verified_claims = await self.key_manager.verify(token=token)
+            token_claims = IDTokenClaims.from_claims(claims=verified_claims, id_token=token)
         else:
-            id_token = token
-        return IDTokenClaims.decode_id_token(id_token=id_token)
+            token_claims = IDTokenClaims.decode_id_token(id_token=token)
+        if token_claims:
+            self.claims_cache.put(token=token, claims=token_claims)
+        return token_claims
 
-    def logout(self, request: Request, callback_url: str) -> RedirectResponse:
-        SessionManager(request=request).clear()
+    async def logout(self, request: Request, callback_url: str) -> RedirectResponse:
+        await self.session(request=request).clear()
         logout_url = f"{self.client_config.authority}/oauth2/v2.0/logout?post_logout_redirect_uri={callback_url}"
         return RedirectResponse(url=logout_url)
 
-    @staticmethod
-    async def get_token_from_session(request: Request) -> Optional[AuthToken]:
-        return await AuthToken.load_from_session(session=SessionManager(request=request))
+    async def get_token_from_session(self, request: Request) -> Optional[AuthToken]:
+        return await AuthToken.load_from_session(session=self.session(request=request))
 
     @staticmethod
-    def _load_cache(session: StrsDict) -> SerializableTokenCache:
-        cache: SerializableTokenCache = SerializableTokenCache()
-        token_cache = session.get("token_cache", None)
-        if token_cache:
-            cache.deserialize(token_cache)
+    async def _load_cache(session: SessionManager, *credential_types: str) -> PartitionedTokenCache:
+        cache: PartitionedTokenCache = PartitionedTokenCache()
+        await cache.load(session, *credential_types)
         return cache
 
     @staticmethod
-    def _save_cache(session: StrsDict, cache: SerializableTokenCache) -> None:
+    async def _save_cache(session: SessionManager, cache: PartitionedTokenCache) -> None:
         if cache.has_state_changed:
-            session["token_cache"] = cache.serialize()
+            await cache.save(session)
 
-    def msal_app(self, cache: Optional[SerializableTokenCache] = None) -> AsyncConfClient:
+    def msal_app(self, cache: Optional[TokenCache] = None) -> AsyncConfClient:
         return AsyncConfClient(client_config=self.client_config, cache=cache)
 
-    async def _get_token_from_cache(self, session: StrsDict, user_id: OptStr = None) -> Optional[AuthToken]:
-        cache: SerializableTokenCache = self._load_cache(session=session)
-        acc: AsyncConfClient = self.msal_app(cache=cache)
-        accounts: list[LocalAccount] = await acc.get_accounts()
-        if accounts and accounts[0] and accounts[0].local_account_id == user_id:
-            token: Optional[AuthToken] = await acc.acquire_token_silent(account=accounts[0])
-            self._save_cache(session=session, cache=cache)
-            return token
+    async def _get_token_from_cache(self, session: SessionManager, user_id: OptStr = None) -> Optional[AuthToken]:
+        async with session.lock():
+            # only the accounts are needed to decide whether the rest of the cache is relevant
+            cache = await self._load_cache(session, PartitionedTokenCache.CredentialType.ACCOUNT)
+            acc: AsyncConfClient = self.msal_app(cache=cache)
+            accounts: list[LocalAccount] = await acc.get_accounts()
+            if accounts and accounts[0] and accounts[0].local_account_id == user_id:
+                await cache.load(session)
+                token: Optional[AuthToken] = await acc.acquire_token_silent(account=accounts[0])
+                await self._save_cache(session=session, cache=cache)
+                return token
         return None
@@ -51,6 +51,9 @@ class MSALScheme(SecurityBase):
         scheme, token = get_authorization_scheme_param(authorization)
         if authorization and scheme.lower() == "bearer":
             token_claims = await self.handler.parse_id_token(token=token)
+            if not token_claims:
+                http_exception.detail = "Invalid token"
+                raise http_exception
         else:
             # 1.b. retrieve token from session
             session_token: Optional[AuthToken] = await self.handler.get_token_from_session(request=request)
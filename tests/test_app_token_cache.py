@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+from fastapi_msal.clients import AppTokenCache
+from fastapi_msal.models import AuthToken
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    AppTokenCache.clear()
+    yield
+    AppTokenCache.clear()
+
+
+def make_fetch(calls, expires_in=3600):
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return AuthToken(id_token="", access_token=f"token{len(calls)}", expires_in=expires_in)
+
+    return fetch
+
+
+@pytest.mark.anyio
+async def test_concurrent_callers_share_one_fetch():
+    calls = []
+    tokens = await asyncio.gather(*[AppTokenCache.get_token(key="app", fetch=make_fetch(calls)) for _ in range(10)])
+    assert len(calls) == 1
+    assert {token.access_token for token in tokens} == {"token1"}
+    assert (await AppTokenCache.get_token(key="app", fetch=make_fetch(calls))).access_token == "token1"
+    assert len(calls) == 1
+
+
+@pytest.mark.anyio
+async def test_refreshes_in_background_before_expiry():
+    calls = []
+    fetch = make_fetch(calls, expires_in=0.2)
+    await AppTokenCache.get_token(key="app", fetch=fetch, refresh_ratio=0.25)
+    await asyncio.sleep(0.08)
+    assert (await AppTokenCache.get_token(key="app", fetch=fetch, refresh_ratio=0.25)).access_token == "token1"
+    await asyncio.sleep(0.03)
+    assert len(calls) == 2
+    assert (await AppTokenCache.get_token(key="app", fetch=fetch, refresh_ratio=0.25)).access_token == "token2"
@@ -0,0 +1,33 @@
+import base64
+import json
+
+from fastapi_msal.models import IDTokenClaims
+from fastapi_msal.security import ClaimsCache
+
+
+def make_token(**claims):
+    payload = base64.urlsafe_b64encode(json.dumps(claims).encode()).decode().rstrip("=")
+    return f"header.{payload}.signature"
+
+
+def test_cached_until_expiry():
+    cache = ClaimsCache(max_entries=10)
+    token = make_token(oid="user", exp=2000)
+    claims = IDTokenClaims.decode_id_token(token)
+    cache.put(token=token, claims=claims, now=1000)
+    assert cache.get(token=token, now=1500) is claims
+    assert cache.get(token=make_token(oid="other", exp=2000), now=1500) is None
+    assert cache.get(token=token, now=2001) is None
+    assert len(cache) == 0
+
+
+def test_bounded_and_skips_tokens_without_expiry():
+    cache = ClaimsCache(max_entries=2)
+    tokens = [make_token(oid=f"user{i}", exp=2000) for i in range(3)]
+    for token in tokens:
+        cache.put(token=token, claims=IDTokenClaims.decode_id_token(token), now=1000)
+    assert len(cache) == 2
+    assert cache.get(token=tokens[0], now=1000) is None
+    no_exp = make_token(oid="user")
+    cache.put(token=no_exp, claims=IDTokenClaims.decode_id_token(no_exp), now=1000)
+    assert cache.get(token=no_exp, now=1000) is None
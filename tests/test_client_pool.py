@@ -0,0 +1,59 @@
+import pytest
+from msal import SerializableTokenCache
+
+from fastapi_msal import MSALClientConfig
+from fastapi_msal.clients import AsyncConfClient, ClientPool, client_pool
+
+
+class FakeConfidentialClientApplication:
+    instances = 0
+
+    def __init__(self, **kwargs):
+        FakeConfidentialClientApplication.instances += 1
+        self.client_credential = kwargs.get("client_credential")
+        self.authority = kwargs.get("authority")
+        self.token_cache = None
+        self.client, self._regional_client = self._build_client(self.client_credential, self.authority)
+
+    def _build_client(self, client_credential, authority):
+        return (client_credential, authority, self.token_cache), None
+
+
+@pytest.fixture(autouse=True)
+def fake_cca(monkeypatch):
+    FakeConfidentialClientApplication.instances = 0
+    monkeypatch.setattr(client_pool, "ConfidentialClientApplication", FakeConfidentialClientApplication)
+    ClientPool.clear()
+    yield
+    ClientPool.clear()
+
+
+@pytest.fixture
+def client_config():
+    return MSALClientConfig(client_id="client", client_credential="secret", tenant="tenant")
+
+
+@pytest.mark.anyio
+async def test_single_app_per_config(client_config):
+    same_config = MSALClientConfig(client_id="client", client_credential="secret", tenant="tenant")
+    await AsyncConfClient(client_config=client_config)._get_cca()
+    await AsyncConfClient(client_config=client_config, cache=SerializableTokenCache())._get_cca()
+    await AsyncConfClient(client_config=same_config)._get_cca()
+    assert FakeConfidentialClientApplication.instances == 1
+
+
+def test_new_app_for_other_authority(client_config):
+    ClientPool.get_app(client_config)
+    ClientPool.get_app(MSALClientConfig(client_id="client", client_credential="secret", tenant="other"))
+    assert FakeConfidentialClientApplication.instances == 2
+
+
+def test_bind_attaches_cache(client_config):
+    cache = SerializableTokenCache()
+    shared_app = ClientPool.get_app(client_config)
+    bound_app = ClientPool.bind(client_config=client_config, cache=cache)
+    assert bound_app is not shared_app
+    assert bound_app.token_cache is cache
+    assert bound_app.client[2] is cache
+    assert shared_app.token_cache is None
+    assert ClientPool.bind(client_config=client_config) is shared_app
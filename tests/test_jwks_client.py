@@ -0,0 +1,56 @@
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from fastapi_msal import MSALClientConfig
+from fastapi_msal.clients import JWKSKeyManager
+
+
+def make_key(kid):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    public_jwk = jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    return private_key, jwt.PyJWK(dict(public_jwk, kid=kid, alg="RS256"))
+
+
+@pytest.fixture
+def key_manager(monkeypatch):
+    manager = JWKSKeyManager(client_config=MSALClientConfig(tenant="tenant"), refresh_interval=0)
+    manager.fetches = 0
+    manager.published = {}
+
+    def fetch_keys():
+        manager.fetches += 1
+        return dict(manager.published)
+
+    monkeypatch.setattr(manager, "_fetch_keys", fetch_keys)
+    return manager
+
+
+@pytest.mark.anyio
+async def test_verify_with_cached_keys(key_manager):
+    private_key, public_key = make_key("kid1")
+    key_manager.published["kid1"] = public_key
+    token = jwt.encode({"oid": "user"}, private_key, algorithm="RS256", headers={"kid": "kid1"})
+    assert (await key_manager.verify(token))["oid"] == "user"
+    assert (await key_manager.verify(token))["oid"] == "user"
+    assert key_manager.fetches == 1
+
+    other_private_key, _ = make_key("kid1")
+    forged = jwt.encode({"oid": "user"}, other_private_key, algorithm="RS256", headers={"kid": "kid1"})
+    assert await key_manager.verify(forged) is None
+
+
+@pytest.mark.anyio
+async def test_unknown_kid_refetched_once(key_manager):
+    private_key, public_key = make_key("rotated")
+    token = jwt.encode({"oid": "user"}, private_key, algorithm="RS256", headers={"kid": "rotated"})
+    key_manager.min_refetch_interval = 0
+    await key_manager.refresh()
+    key_manager.published["rotated"] = public_key
+    assert (await key_manager.verify(token))["oid"] == "user"
+    assert key_manager.fetches == 2
+
+    key_manager.min_refetch_interval = 300
+    unknown = jwt.encode({"oid": "user"}, private_key, algorithm="RS256", headers={"kid": "unknown"})
+    assert await key_manager.verify(unknown) is None
+    assert key_manager.fetches == 2
@@ -0,0 +1,101 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from fastapi_msal.core import InMemoryBackend, SessionManager, SQLiteBackend
+from fastapi_msal.models import AuthCode, AuthResponse
+
+
+@pytest.fixture(params=["in_memory", "sqlite"])
+async def backend(request, tmp_path):
+    if request.param == "sqlite":
+        session_backend = SQLiteBackend(path=str(tmp_path / "sessions.db"), pool_size=2)
+    else:
+        session_backend = InMemoryBackend()
+    yield session_backend
+    await session_backend.close()
+
+
+def make_session(backend, session_id="sid-1"):
+    request = SimpleNamespace(session={})
+    session = SessionManager(request=request, backend=backend)
+    session.init_session(session_id=session_id)
+    return session
+
+
+@pytest.mark.anyio
+async def test_save_and_load(backend):
+    session = make_session(backend)
+    auth_code = AuthCode(state="state", redirect_uri="http://localhost/token", auth_uri="http://localhost/auth")
+    await session.save(auth_code)
+    await session.save(AuthResponse(state="state", code="code"))
+    loaded = await make_session(backend).load(AuthCode)
+    assert loaded == auth_code
+    assert (await make_session(backend).load(AuthResponse)).code == "code"
+    assert await make_session(backend, session_id="sid-2").load(AuthCode) is None
+
+
+@pytest.mark.anyio
+async def test_clear(backend):
+    session = make_session(backend)
+    await session.save(AuthResponse(state="state", code="code"))
+    await session.clear()
+    assert session.session_id is None
+    assert await make_session(backend).load(AuthResponse) is None
+
+
+@pytest.mark.anyio
+async def test_save_requires_session_id():
+    session = SessionManager(request=SimpleNamespace(session={}), backend=InMemoryBackend())
+    with pytest.raises(OSError, match="No session id"):
+        await session.save(AuthResponse(state="state"))
+
+
+@pytest.mark.anyio
+async def test_concurrent_saves_keep_all_models(backend):
+    auth_code = AuthCode(state="state", redirect_uri="http://localhost/token", auth_uri="http://localhost/auth")
+    auth_response = AuthResponse(state="state", code="code")
+    await asyncio.gather(make_session(backend).save(auth_code), make_session(backend).save(auth_response))
+    assert await make_session(backend).load(AuthCode) == auth_code
+    assert await make_session(backend).load(AuthResponse) == auth_response
+
+
+@pytest.mark.anyio
+async def test_session_lock():
+    backend = InMemoryBackend()
+    session = make_session(backend)
+    async with session.lock():
+        assert make_session(backend).lock().locked()
+        assert not make_session(backend, session_id="sid-2").lock().locked()
+
+
+@pytest.mark.anyio
+async def test_in_memory_evicts_least_recently_used():
+    backend = InMemoryBackend(max_entries=2)
+    await backend.set_field("a", "k", b"a")
+    await backend.set_field("b", "k", b"b")
+    await backend.get_field("a", "k")
+    await backend.set_field("c", "k", b"c")
+    assert await backend.get_field("b", "k") is None
+    assert await backend.get_field("a", "k") == b"a"
+    assert len(backend) == 2
+    assert backend.stats.evicted == 1
+
+
+@pytest.mark.anyio
+async def test_in_memory_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("fastapi_msal.core.session_backends.time.monotonic", lambda: now[0])
+    backend = InMemoryBackend(idle_ttl=10, absolute_ttl=25)
+    await backend.set_field("idle", "k", b"v")
+    await backend.set_field("active", "k", b"v")
+    for _ in range(3):
+        now[0] += 8
+        assert await backend.get_field("active", "k") == b"v"
+    assert await backend.get_field("idle", "k") is None
+    now[0] += 2
+    backend.sweep()
+    assert len(backend) == 0
+    assert backend.stats.expired_idle == 1
+    assert backend.stats.expired_absolute == 1
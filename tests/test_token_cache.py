@@ -0,0 +1,59 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from fastapi_msal.clients import PartitionedTokenCache
+from fastapi_msal.core import InMemoryBackend, SessionManager
+
+TOKEN_ENDPOINT = "https://login.microsoftonline.com/tenant/oauth2/v2.0/token"  # noqa: S105
+
+
+def token_event(scope, access_token):
+    return {
+        "client_id": "client",
+        "scope": [scope],
+        "token_endpoint": TOKEN_ENDPOINT,
+        "response": {"access_token": access_token, "refresh_token": "rt", "expires_in": 3600},
+    }
+
+
+@pytest.fixture
+def session():
+    session_manager = SessionManager(request=SimpleNamespace(session={}), backend=InMemoryBackend())
+    session_manager.init_session(session_id="sid")
+    return session_manager
+
+
+async def load_partition(session, credential_type):
+    return json.loads(await session.load_raw(field=f"{PartitionedTokenCache.field_prefix}{credential_type}"))
+
+
+@pytest.mark.anyio
+async def test_saves_only_changed_partitions(session):
+    cache = PartitionedTokenCache()
+    cache.add(token_event("scope1", "at1"))
+    assert cache.changed_partitions == {"AccessToken", "RefreshToken", "AppMetadata"}
+    await cache.save(session)
+    assert not cache.has_state_changed
+
+    cache = PartitionedTokenCache()
+    await cache.load(session)
+    cache.add(token_event("scope2", "at2"))
+    assert cache.changed_partitions == {"AccessToken", "RefreshToken"}  # new RT target, same app metadata
+    await cache.save(session)
+    assert len(await load_partition(session, "AccessToken")) == 2
+
+
+@pytest.mark.anyio
+async def test_save_merges_unloaded_partitions(session):
+    cache = PartitionedTokenCache()
+    cache.add(token_event("scope1", "at1"))
+    await cache.save(session)
+
+    cache = PartitionedTokenCache()
+    await cache.load(session, PartitionedTokenCache.CredentialType.ACCOUNT)
+    cache.add(token_event("scope2", "at2"))
+    await cache.save(session)
+    secrets = {at["secret"] for at in (await load_partition(session, "AccessToken")).values()}
+    assert secrets == {"at1", "at2"}